@@ -1,9 +1,185 @@
 import pyperclip
-import subprocess
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import shutil
+import socket
+import sys
+import threading
 import time
 import re
 
 POLL_INTERVAL_SECONDS = 0.5  # How often to check the clipboard (in seconds)
+LATEX_SCAN_LIMIT = 8192  # Only the first N characters are scanned for LaTeX indicators
+CLASSIFY_CACHE_SIZE = 128  # How many recent texts keep their LaTeX classification cached
+CLASSIFY_CACHE_MAX_LENGTH = 65536  # Longer texts are classified without caching to bound memory
+SHOW_SNIPPETS = sys.stdout is not None and sys.stdout.isatty()  # Skip building content snippets when output isn't a terminal
+PERSISTENT_PANDOC = False  # Reuse one `pandoc server` process instead of spawning pandoc per conversion (listens on all interfaces, see README)
+PANDOC_SERVER_STARTUP_SECONDS = 5  # How long to wait for `pandoc server` to accept connections
+PANDOC_TIMEOUT_SECONDS = 30  # Give up on a conversion (and stop Pandoc) after this long
+
+PANDOC_COMMAND = ["pandoc", "-f", "latex", "-t", "typst"]
+
+_NL = "\n"
+
+# Bits returned by classify_latex
+LATEX_INDICATORS = 1  # Looks like LaTeX (is_likely_latex)
+MATH_DELIMITERS = 2  # Already has math delimiters (has_math_delimiters)
+MATH_COMMANDS = 4  # Has math commands or sub/superscripts (has_math_commands)
+_ALL_CLASSES = LATEX_INDICATORS | MATH_DELIMITERS | MATH_COMMANDS
+
+# Common math commands that need math delimiters when used without them
+_MATH_COMMAND_NAMES = frozenset(
+    {
+        "frac", "sqrt", "sum", "int", "prod", "lim",
+        "sin", "cos", "tan", "log", "ln", "exp",
+        "alpha", "beta", "gamma", "delta", "epsilon", "theta", "lambda", "mu",
+        "pi", "sigma", "phi", "omega", "infty", "partial", "nabla",
+        "cdot", "times", "div", "pm", "mp",
+        "leq", "geq", "neq", "approx", "equiv", "propto",
+        "subset", "supset", "in", "notin", "cup", "cap", "forall", "exists",
+        "mathbb", "mathcal", "mathrm", "operatorname",
+    }
+)
+
+# Tokens the classifiers look for, with the classes each one can decide.
+# Keep these to plain literals, character classes and single repetitions (no
+# backreferences, lookarounds or nested quantifiers): together with the single
+# forward pass in classify_latex this keeps classification linear in the text
+# length, so hostile clipboard content can't trigger catastrophic backtracking.
+_CLASSIFY_TOKENS = (
+    ("env", r"\\begin\{(?:equation|align|gather|eqnarray|displaymath|math)\}", LATEX_INDICATORS | MATH_DELIMITERS),  # Math environments
+    ("open_bracket", r"\\\[", LATEX_INDICATORS | MATH_DELIMITERS),  # \[ (start of display math)
+    ("open_paren", r"\\\(", LATEX_INDICATORS | MATH_DELIMITERS),  # \( (start of inline math)
+    ("close_bracket", r"\\\]", MATH_DELIMITERS),  # \] (end of display math)
+    ("close_paren", r"\\\)", MATH_DELIMITERS),  # \) (end of inline math)
+    ("command", r"\\[a-zA-Z]+", LATEX_INDICATORS | MATH_COMMANDS),  # \command (e.g., \frac, \begin); math ones are in _MATH_COMMAND_NAMES
+    ("dollar", r"\$", LATEX_INDICATORS | MATH_DELIMITERS),  # $ ($$ when two are adjacent)
+    ("script", r"[\^_]\S", LATEX_INDICATORS | MATH_COMMANDS),  # ^. _. (super/subscript with braces or a single non-space char)
+)
+
+
+def _compile_classifier(undecided):
+    """
+    Compiles the scanner used while the classes in `undecided` are still unknown.
+    Returns a tuple: (regex finding the next relevant token, regex telling which token it is)
+    """
+    tokens = [(name, pattern) for name, pattern, classes in _CLASSIFY_TOKENS if classes & undecided]
+    return (
+        re.compile("|".join(f"(?:{pattern})" for _, pattern in tokens)),
+        re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in tokens)),
+    )
+
+
+# One scanner per set of still undecided classes, compiled once at import time.
+# Tokens are found with a group-free alternation, which the regex engine
+# searches much faster than one with named groups, and only the match is
+# re-read with the named groups. Once a class is decided its tokens drop out,
+# so the rest of the text is searched for fewer tokens while still being
+# traversed only once.
+_CLASSIFIERS = {
+    undecided: _compile_classifier(undecided)
+    for undecided in range(1, _ALL_CLASSES + 1)
+}
+
+# Once LATEX_INDICATORS is known, commands and sub/superscripts only matter for
+# MATH_COMMANDS, which these settle for the rest of the text in a single pass
+_COMMAND_NAME_RE = re.compile(r"\\([a-zA-Z]+)")
+_SCRIPT_RE = re.compile(r"[\^_]\S")
+
+# Closing math delimiter token -> the opening one it pairs with
+_MATCHING_OPEN_DELIMITER = {"close_bracket": "open_bracket", "close_paren": "open_paren"}
+
+# Every token above contains one of these characters, so text without any of
+# them can be rejected with plain substring checks before running the regex
+_LATEX_MARKERS = ("\\", "$", "^", "_")
+
+
+def _cached_classifier(classify):
+    """
+    Caches a text classifier's results in an LRU cache keyed on the text, so
+    re-copied content isn't re-scanned. Texts longer than CLASSIFY_CACHE_MAX_LENGTH
+    (and non-strings) bypass the cache.
+    """
+    cached_classify = functools.lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(classify)
+
+    @functools.wraps(classify)
+    def wrapper(text):
+        if not isinstance(text, str) or len(text) > CLASSIFY_CACHE_MAX_LENGTH:
+            return classify(text)
+        return cached_classify(text)
+
+    return wrapper
+
+
+@_cached_classifier
+def classify_latex(text):
+    """
+    Scans the text once and returns a bitmask of LATEX_INDICATORS, MATH_DELIMITERS
+    and MATH_COMMANDS for the classes of LaTeX constructs it contains.
+    """
+    if not text or not isinstance(text, str):
+        return 0
+    if not any(marker in text for marker in _LATEX_MARKERS):
+        return 0
+
+    flags = 0
+    settled = 0  # Classes known to be absent from the rest of the text
+    dollar_count = 0
+    last_dollar_end = -1
+    open_delimiters = set()  # Which opening delimiter tokens were seen so far
+    position = 0
+    while undecided := _ALL_CLASSES & ~(flags | settled):
+        if undecided & MATH_COMMANDS and not undecided & LATEX_INDICATORS:
+            # Check all remaining command names in one set operation instead of
+            # one loop iteration per command, which dominates on text-mode LaTeX.
+            # Neither token overlaps the delimiter tokens, so skipping them
+            # doesn't change what the loop finds next.
+            if _SCRIPT_RE.search(text, position) or not _MATH_COMMAND_NAMES.isdisjoint(
+                _COMMAND_NAME_RE.findall(text, position)
+            ):
+                flags |= MATH_COMMANDS
+            else:
+                settled |= MATH_COMMANDS
+            continue
+
+        search_re, token_re = _CLASSIFIERS[undecided]
+        found = search_re.search(text, position)
+        if found is None:
+            break
+        match = token_re.match(text, found.start())
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "env":
+            flags |= LATEX_INDICATORS | MATH_DELIMITERS
+        elif kind in ("open_bracket", "open_paren"):
+            flags |= LATEX_INDICATORS
+            open_delimiters.add(kind)
+        elif kind in _MATCHING_OPEN_DELIMITER:
+            # \[...\] and \(...\) count once the matching opener was seen
+            if _MATCHING_OPEN_DELIMITER[kind] in open_delimiters:
+                flags |= MATH_DELIMITERS
+        elif kind == "command":
+            flags |= LATEX_INDICATORS
+            # One set lookup per command instead of a regex alternation of names
+            if match.group()[1:] in _MATH_COMMAND_NAMES:
+                flags |= MATH_COMMANDS
+        elif kind == "dollar":
+            # $...$ and $$...$$ need two dollar signs; $$ itself is a LaTeX indicator
+            dollar_count += 1
+            if dollar_count >= 2:
+                flags |= MATH_DELIMITERS
+            if match.start() == last_dollar_end:
+                flags |= LATEX_INDICATORS
+            last_dollar_end = match.end()
+        else:  # script
+            flags |= LATEX_INDICATORS | MATH_COMMANDS
+            # The character after ^ or _ may start a token itself (e.g. x^\alpha)
+            position = match.start() + 1
+
+    return flags
 
 
 def is_likely_latex(text):
@@ -14,28 +190,11 @@ def is_likely_latex(text):
     if not text or not isinstance(text, str):
         return False
 
-    # Try to match common LaTeX patterns:
-    # - \command (e.g., \frac, \alpha)
-    # - LaTeX math delimiters: \[, \], $$m etc.
-    # - LaTeX environments: \begin{...}
-    # - Common math structures: ^{...}, _{...}, ^x, _x,
-    patterns = [
-        r"\\[a-zA-Z]+",  # \command (e.g., \frac, \alpha)
-        r"\\\[",  # \[ (start of display math) - matches literal '\['
-        r"\\\(",  # \( (start of inline math) - matches literal '\('
-        r"\$\$",  # $$ (alternative display math)
-        r"\\begin\{[a-zA-Z*]+\}",  # \begin{environment}
-        r"\^\{",  # ^{ (superscript with braces)
-        r"\_\{",  # _{ (subscript with braces)
-        r"\^\S",  # ^. (superscript with a single non-space char, e.g., x^2, x^*)
-        r"\_\S",  # _. (subscript with a single non-space char, e.g., x_1, x_i)
-    ]
-
-    for pattern in patterns:
-        if re.search(pattern, text):
-            return True
-
-    return False
+    # LaTeX indicators appear near the start in practice, so bound the scan
+    # regardless of how large the clipboard content is. For shorter texts the
+    # slice is the text itself, so the classification is shared with
+    # has_math_delimiters and has_math_commands via the cache.
+    return bool(classify_latex(text[:LATEX_SCAN_LIMIT]) & LATEX_INDICATORS)
 
 
 def has_math_delimiters(text):
@@ -43,23 +202,15 @@ def has_math_delimiters(text):
     Checks if the text already has LaTeX math delimiters.
     Returns True if delimiters are found, False otherwise.
     """
-    if not text:
-        return False
-    
-    # Check for common math delimiters
-    delimiter_patterns = [
-        r"\$.*\$",           # Inline math: $...$
-        r"\$\$.*\$\$",       # Display math: $$...$$
-        r"\\\[.*\\\]",       # Display math: \[...\]
-        r"\\\(.*\\\)",       # Inline math: \(...\)
-        r"\\begin\{(equation|align|gather|eqnarray|displaymath|math)\}",  # Math environments
-    ]
-    
-    for pattern in delimiter_patterns:
-        if re.search(pattern, text, re.DOTALL):
-            return True
-    
-    return False
+    return bool(classify_latex(text) & MATH_DELIMITERS)
+
+
+def has_math_commands(text):
+    """
+    Checks if the text contains LaTeX math commands or sub/superscripts.
+    Returns True if any are found, False otherwise.
+    """
+    return bool(classify_latex(text) & MATH_COMMANDS)
 
 
 def preprocess_latex_input(latex_input):
@@ -71,23 +222,15 @@ def preprocess_latex_input(latex_input):
     if not latex_input or not isinstance(latex_input, str):
         return latex_input, False
     
+    # One scan for both checks (long texts bypass the classification cache)
+    classes = classify_latex(latex_input)
+
     # If it already has math delimiters, return as-is
-    if has_math_delimiters(latex_input):
+    if classes & MATH_DELIMITERS:
         return latex_input, False
     
-    # Check if it contains LaTeX math commands but no delimiters
-    math_command_patterns = [
-        r"\\(frac|sqrt|sum|int|prod|lim|sin|cos|tan|log|ln|exp|alpha|beta|gamma|delta|epsilon|theta|lambda|mu|pi|sigma|phi|omega|infty|partial|nabla|cdot|times|div|pm|mp infty|leq|geq|neq|approx|equiv|propto|subset|supset|in|notin|cup|cap|forall|exists|mathbb|mathcal|mathrm|operatorname)\b",  # Common math commands
-        r"\^\{",             # Superscript with braces
-        r"\_\{",             # Subscript with braces
-        r"\^\S",             # Superscript with single char
-        r"\_\S",             # Subscript with single char
-    ]
-    
-    contains_math_commands = any(re.search(pattern, latex_input) for pattern in math_command_patterns)
-    
     # If it contains math commands but no delimiters, wrap in display math
-    if contains_math_commands:
+    if classes & MATH_COMMANDS:
         return f"$${latex_input}$$", True  # Return flag indicating we added delimiters
     
     # Otherwise, return as-is
@@ -106,13 +249,15 @@ def post_process_typst_output(typst_text, is_raw_math=False):
 
     processed_text = typst_text
 
-    # Replace \( and \) with ( and )
-    processed_text = re.sub(r"\\(\()", r"(", processed_text)
-    processed_text = re.sub(r"\\(\))", r")", processed_text)
-
-    # Replace \[ and \] with [ and ]
-    processed_text = re.sub(r"\\(\[)", r"[", processed_text)
-    processed_text = re.sub(r"\\(\])", r"]", processed_text)
+    # Replace \( \) \[ \] with ( ) [ ]; these are plain literals, so C-level
+    # str.replace is used instead of the regex engine
+    if "\\" in processed_text:
+        processed_text = (
+            processed_text.replace("\\(", "(")
+            .replace("\\)", ")")
+            .replace("\\[", "[")
+            .replace("\\]", "]")
+        )
 
     # If this was raw LaTeX input, remove the outer $ delimiters that Pandoc added
     if is_raw_math:
@@ -128,7 +273,180 @@ def post_process_typst_output(typst_text, is_raw_math=False):
     return processed_text
 
 
-def convert_latex_to_typst(latex_input):
+class PandocError(Exception):
+    """Raised when Pandoc rejects the input; the message is Pandoc's error output."""
+
+
+_pandoc_server = None  # (process, port) of the running `pandoc server`
+_pandoc_server_failed = False  # Set once the server could not be used, to stop retrying
+_pandoc_server_lock = asyncio.Lock()  # Only one task may start the server
+
+
+async def _stop_pandoc_server():
+    global _pandoc_server
+    if _pandoc_server is not None:
+        process, _ = _pandoc_server
+        _pandoc_server = None
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+
+
+async def _start_pandoc_server():
+    """
+    Starts `pandoc server` on a free local port and waits until it accepts connections.
+    Returns a tuple (process, port), or None if the server could not be started.
+    Raises FileNotFoundError if Pandoc is not installed.
+    """
+    # `pandoc server` has no bind-address option and listens on all IPv4
+    # interfaces, not just loopback; only the port probe below is local.
+    # That is why PERSISTENT_PANDOC is off by default.
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    process = await asyncio.create_subprocess_exec(
+        "pandoc", "server", "--port", str(port), "--timeout", str(PANDOC_TIMEOUT_SECONDS),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + PANDOC_SERVER_STARTUP_SECONDS
+    while loop.time() < deadline:
+        if process.returncode is not None:
+            # Exited early, e.g. a Pandoc build without server support
+            return None
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return process, port
+
+    process.kill()
+    await process.wait()
+    return None
+
+
+async def _post_to_pandoc_server(port, latex_text):
+    """
+    Sends one conversion request to `pandoc server` and returns (status, body).
+    Speaks HTTP/1.0 so the server answers with a plain body and closes the connection.
+    """
+    body = json.dumps({"text": latex_text, "from": "latex", "to": "typst"}).encode("utf-8")
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(
+            b"POST / HTTP/1.0\r\n"
+            b"Host: 127.0.0.1\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Accept: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+            + body
+        )
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, response_body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])  # "HTTP/1.0 200 OK"
+    return status, response_body
+
+
+async def _convert_with_pandoc_server(latex_text):
+    """
+    Converts LaTeX to Typst through the persistent `pandoc server`, starting it on first use.
+    Returns the raw Pandoc output, or None if the server is unavailable and the
+    caller should run Pandoc directly instead.
+    Raises PandocError if Pandoc rejects the input or the server's own timeout expires.
+    """
+    global _pandoc_server, _pandoc_server_failed
+    async with _pandoc_server_lock:
+        if _pandoc_server_failed:
+            return None
+
+        if _pandoc_server is None:
+            _pandoc_server = await _start_pandoc_server()
+            if _pandoc_server is None:
+                _pandoc_server_failed = True
+                print("    [Warning] Could not start `pandoc server`, running Pandoc per conversion.")
+                return None
+
+        _, port = _pandoc_server
+
+    try:
+        # The server enforces PANDOC_TIMEOUT_SECONDS itself and answers slow
+        # inputs with an error; the client timeout only catches a server that
+        # stopped responding altogether, which is dropped below like a dead one
+        status, body = await asyncio.wait_for(
+            _post_to_pandoc_server(port, latex_text),
+            PANDOC_TIMEOUT_SECONDS + PANDOC_SERVER_STARTUP_SECONDS,
+        )
+        if status != 200:
+            raise PandocError(body.decode("utf-8", errors="replace"))
+        return json.loads(body)["output"]
+    except (OSError, ValueError, IndexError, KeyError) as e:
+        # The server died, hangs (TimeoutError is an OSError) or misbehaves:
+        # fall back to one Pandoc process per conversion
+        if not _pandoc_server_failed:
+            _pandoc_server_failed = True
+            await _stop_pandoc_server()
+            print(f"    [Warning] `pandoc server` failed ({e!r}), running Pandoc per conversion.")
+        return None
+
+
+async def _run_pandoc_process(latex_text):
+    """
+    Converts LaTeX to Typst with a one-off Pandoc process.
+    Returns the raw Pandoc output.
+    Raises PandocError if Pandoc rejects the input or times out.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *PANDOC_COMMAND,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        typst_output, error_output = await asyncio.wait_for(
+            process.communicate(latex_text.encode("utf-8")), PANDOC_TIMEOUT_SECONDS
+        )
+    except TimeoutError:
+        process.kill()
+        await process.wait()
+        raise PandocError(f"Pandoc did not finish within {PANDOC_TIMEOUT_SECONDS} seconds.") from None
+    except asyncio.CancelledError:
+        # The script is stopping, don't leave Pandoc running behind
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    if process.returncode != 0:
+        raise PandocError(error_output.decode("utf-8", errors="replace"))
+
+    # Pipes are binary here, so normalize Windows line endings like text mode did
+    return typst_output.decode("utf-8").replace("\r\n", _NL)
+
+
+async def run_pandoc(latex_text):
+    """
+    Converts LaTeX to Typst with Pandoc, reusing the persistent `pandoc server`
+    when PERSISTENT_PANDOC is enabled and it is available.
+    Returns the raw Pandoc output.
+    Raises PandocError if Pandoc rejects the input or times out.
+    """
+    typst_output = None
+    if PERSISTENT_PANDOC:
+        typst_output = await _convert_with_pandoc_server(latex_text)
+    if typst_output is None:
+        typst_output = await _run_pandoc_process(latex_text)
+    return typst_output
+
+
+async def convert_latex_to_typst(latex_input):
     """
     Converts a LaTeX string to Typst using Pandoc.
     Returns the Typst string or None if conversion fails.
@@ -136,28 +454,19 @@ def convert_latex_to_typst(latex_input):
     try:
         # Preprocess the input to ensure proper math delimiters
         processed_input, is_raw_math = preprocess_latex_input(latex_input)
-        
-        pandoc_command = ["pandoc", "-f", "latex", "-t", "typst"]
-        process = subprocess.Popen(
-            pandoc_command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",
-        )
-        typst_output, error_output = process.communicate(input=processed_input)
 
-        if process.returncode != 0:
-            print("\n[Pandoc Error] Conversion failed.")
-            print(
-                f"Pandoc stderr:\n{error_output if error_output.strip() else '[No stderr]'}"
-            )
-            return None
+        typst_output = await run_pandoc(processed_input)
 
         # Post-process with the raw LaTeX flag
         return post_process_typst_output(typst_output, is_raw_math)
 
+    except PandocError as e:
+        error_output = str(e)
+        print("\n[Pandoc Error] Conversion failed.")
+        print(
+            f"Pandoc stderr:\n{error_output if error_output.strip() else '[No stderr]'}"
+        )
+        return None
     except FileNotFoundError:
         print("[Error] Pandoc command not found.")
         print("Please ensure Pandoc is installed and added to your system's PATH.")
@@ -167,99 +476,442 @@ def convert_latex_to_typst(latex_input):
         return None
 
 
-def main():
+class ConversionRunner:
+    """
+    Runs conversions in a background task so clipboard watching stays responsive.
+    A snippet submitted while idle is converted right away. While Pandoc is busy
+    only the newest submitted snippet is kept: older ones can no longer be copied
+    to the clipboard anyway, since it has changed since they were copied.
+    Each snippet's callback receives its Typst string or None if conversion failed.
+    Must be used from the event loop's thread.
+    """
+
+    def __init__(self):
+        self._pending = None  # Newest (latex_input, callback) waiting for Pandoc
+        self._drain_task = None  # Set while conversions are running
+
+    def submit(self, latex_input, callback):
+        if self._pending is not None:
+            print("    Skipping the previous snippet, newer content was copied while Pandoc was busy.")
+        self._pending = (latex_input, callback)
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self._drain())
+
+    async def shutdown(self):
+        self._pending = None
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._drain_task
+
+    async def _drain(self):
+        try:
+            while self._pending is not None:
+                latex_input, callback = self._pending
+                self._pending = None
+
+                try:
+                    callback(await convert_latex_to_typst(latex_input))
+                except Exception as e:
+                    print(f"\n  [Unexpected Error] An error occurred during conversion: {e}")
+        finally:
+            self._drain_task = None
+
+
+def one_line_snippet(text, max_length):
+    """
+    Returns the first max_length characters of text on a single line for compact display,
+    with "..." appended if it was cut off.
+    """
+    # Slice first so newlines are only replaced in the displayed part
+    snippet = text[:max_length].replace(_NL, " ")
+    return snippet + "..." if len(text) > max_length else snippet
+
+
+async def _poll_clipboard():
+    """
+    Fallback watcher: wakes every POLL_INTERVAL_SECONDS and lets the caller
+    compare the clipboard content itself.
+    """
+    while True:
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        yield
+
+
+async def _watch_macos_pasteboard(NSPasteboard):
+    """
+    Polls NSPasteboard's changeCount, a cheap integer that increments on every
+    clipboard write, so the clipboard string is only read after a real change.
+    """
+    pasteboard = NSPasteboard.generalPasteboard()
+    last_change_count = pasteboard.changeCount()
+    while True:
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        change_count = pasteboard.changeCount()
+        if change_count != last_change_count:
+            last_change_count = change_count
+            yield
+
+
+async def _watch_wl_paste():
+    """
+    Uses `wl-paste --watch`, which runs a command (here `echo`) every time the
+    Wayland clipboard changes, so each output line is one change.
+    """
+    watcher = await asyncio.create_subprocess_exec(
+        "wl-paste", "--watch", "echo",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        async for _ in watcher.stdout:
+            yield
+    finally:
+        if watcher.returncode is None:
+            watcher.terminate()
+            await watcher.wait()
+
+
+async def _watch_clipnotify():
+    """
+    Uses clipnotify, which blocks on XFixesSelectionNotify and exits as soon
+    as an X11 selection changes.
+    """
+    while True:
+        notifier = await asyncio.create_subprocess_exec("clipnotify")
+        try:
+            returncode = await notifier.wait()
+        finally:
+            if notifier.returncode is None:
+                notifier.kill()
+                await notifier.wait()
+        if returncode != 0:
+            return
+        yield
+
+
+def _pump_windows_clipboard_messages(notify, stop):
+    """
+    Registers a hidden message-only window with AddClipboardFormatListener and
+    calls notify() on every WM_CLIPBOARDUPDATE message until stop is set.
+    A setup failure is passed to notify(error) instead of being raised.
+    Blocks in the Win32 message loop, so it runs on a helper thread.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    WM_CLIPBOARDUPDATE = 0x031D
+    HWND_MESSAGE = -3
+    PM_REMOVE = 0x0001
+    QS_ALLINPUT = 0x04FF
+    # Wake up periodically to notice that stop was set
+    WAIT_TIMEOUT_MS = int(POLL_INTERVAL_SECONDS * 1000)
+
+    LRESULT = wintypes.LPARAM
+    WNDPROC = ctypes.WINFUNCTYPE(
+        LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM
+    )
+
+    class WNDCLASSW(ctypes.Structure):
+        _fields_ = [
+            ("style", wintypes.UINT),
+            ("lpfnWndProc", WNDPROC),
+            ("cbClsExtra", ctypes.c_int),
+            ("cbWndExtra", ctypes.c_int),
+            ("hInstance", wintypes.HINSTANCE),
+            ("hIcon", wintypes.HICON),
+            ("hCursor", wintypes.HANDLE),
+            ("hbrBackground", wintypes.HBRUSH),
+            ("lpszMenuName", wintypes.LPCWSTR),
+            ("lpszClassName", wintypes.LPCWSTR),
+        ]
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    user32.DefWindowProcW.restype = LRESULT
+    user32.DefWindowProcW.argtypes = [
+        wintypes.HWND,
+        wintypes.UINT,
+        wintypes.WPARAM,
+        wintypes.LPARAM,
+    ]
+    user32.CreateWindowExW.restype = wintypes.HWND
+    user32.CreateWindowExW.argtypes = [
+        wintypes.DWORD,
+        wintypes.LPCWSTR,
+        wintypes.LPCWSTR,
+        wintypes.DWORD,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        wintypes.HWND,
+        wintypes.HMENU,
+        wintypes.HINSTANCE,
+        wintypes.LPVOID,
+    ]
+    kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+    clipboard_changed = False
+
+    @WNDPROC
+    def window_proc(hwnd, message, wparam, lparam):
+        nonlocal clipboard_changed
+        if message == WM_CLIPBOARDUPDATE:
+            clipboard_changed = True
+            return 0
+        return user32.DefWindowProcW(hwnd, message, wparam, lparam)
+
+    window_class = WNDCLASSW()
+    window_class.lpfnWndProc = window_proc
+    window_class.hInstance = kernel32.GetModuleHandleW(None)
+    window_class.lpszClassName = "TexToTypstClipboardListener"
+    if not user32.RegisterClassW(ctypes.byref(window_class)):
+        notify(ctypes.WinError(ctypes.get_last_error()))
+        return
+
+    hwnd = user32.CreateWindowExW(
+        0,
+        window_class.lpszClassName,
+        None,
+        0,
+        0,
+        0,
+        0,
+        0,
+        HWND_MESSAGE,
+        None,
+        window_class.hInstance,
+        None,
+    )
+    if not hwnd:
+        notify(ctypes.WinError(ctypes.get_last_error()))
+        user32.UnregisterClassW(window_class.lpszClassName, window_class.hInstance)
+        return
+
+    try:
+        if not user32.AddClipboardFormatListener(hwnd):
+            notify(ctypes.WinError(ctypes.get_last_error()))
+            return
+
+        message = wintypes.MSG()
+        while not stop.is_set():
+            user32.MsgWaitForMultipleObjects(
+                0, None, False, WAIT_TIMEOUT_MS, QS_ALLINPUT
+            )
+            while user32.PeekMessageW(ctypes.byref(message), hwnd, 0, 0, PM_REMOVE):
+                user32.TranslateMessage(ctypes.byref(message))
+                user32.DispatchMessageW(ctypes.byref(message))
+            if clipboard_changed:
+                clipboard_changed = False
+                notify()
+    finally:
+        user32.RemoveClipboardFormatListener(hwnd)
+        user32.DestroyWindow(hwnd)
+        user32.UnregisterClassW(window_class.lpszClassName, window_class.hInstance)
+
+
+async def _watch_windows_clipboard():
+    """
+    Yields on every Windows clipboard change. The Win32 message loop can't be
+    awaited, so it runs on a helper thread that wakes the event loop through
+    call_soon_threadsafe; changes arriving while the caller is busy are coalesced.
+    """
+    loop = asyncio.get_running_loop()
+    clipboard_changed = asyncio.Event()
+    stop = threading.Event()
+    errors = []
+
+    def notify(error=None):
+        if error is not None:
+            errors.append(error)
+        loop.call_soon_threadsafe(clipboard_changed.set)
+
+    threading.Thread(
+        target=_pump_windows_clipboard_messages, args=(notify, stop), daemon=True
+    ).start()
+    try:
+        while True:
+            await clipboard_changed.wait()
+            clipboard_changed.clear()
+            if errors:
+                raise errors[0]
+            yield
+    finally:
+        stop.set()
+
+
+async def _watch_with_fallback(watcher):
+    """
+    Runs an OS-specific watcher and falls back to polling if it fails or stops.
+    """
+    try:
+        async for _ in watcher:
+            yield
+        print("\n  [Warning] Clipboard watcher stopped unexpectedly.")
+    except Exception as e:
+        # e.g. OSError from a watcher process, or objc.error from PyObjC
+        print(f"\n  [Warning] Clipboard watcher failed: {e}")
+    print(f"  Falling back to polling the clipboard every {POLL_INTERVAL_SECONDS} seconds.")
+    async for _ in _poll_clipboard():
+        yield
+
+
+def watch_clipboard_changes():
+    """
+    Picks the cheapest available way to wait for clipboard changes:
+    - Windows: WM_CLIPBOARDUPDATE notifications
+    - macOS: NSPasteboard changeCount (requires pyobjc)
+    - Linux: `wl-paste --watch` on Wayland, clipnotify on X11
+    Polling is used when none of these are available.
+    Returns a tuple: (description, async generator yielding once per possible change)
+    The caller still compares the clipboard content, so spurious wake-ups are harmless.
+    """
+    if sys.platform == "win32":
+        return (
+            "Windows clipboard notifications",
+            _watch_with_fallback(_watch_windows_clipboard()),
+        )
+
+    if sys.platform == "darwin":
+        try:
+            from AppKit import NSPasteboard
+        except ImportError:
+            pass
+        else:
+            return (
+                f"NSPasteboard changeCount every {POLL_INTERVAL_SECONDS} seconds",
+                _watch_with_fallback(_watch_macos_pasteboard(NSPasteboard)),
+            )
+
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-paste"):
+        return "wl-paste --watch", _watch_with_fallback(_watch_wl_paste())
+
+    if os.environ.get("DISPLAY") and shutil.which("clipnotify"):
+        return "clipnotify", _watch_with_fallback(_watch_clipnotify())
+
+    return f"polling every {POLL_INTERVAL_SECONDS} seconds", _poll_clipboard()
+
+
+async def main_async():
+    if shutil.which("pandoc") is None:
+        print("[Error] Pandoc command not found.")
+        print("Please ensure Pandoc is installed and added to your system's PATH.")
+        raise SystemExit("Pandoc not found. Exiting.")
+
+    clipboard_watch_method, clipboard_changes = watch_clipboard_changes()
+
     print("  Smart Auto Mathpix LaTeX to Typst Converter is RUNNING...")
-    print(f"  Monitoring clipboard every {POLL_INTERVAL_SECONDS} seconds.")
+    print(f"  Monitoring clipboard via {clipboard_watch_method}.")
     print("  Will only process content recognized as LaTeX.")
     print("  Press Ctrl+C to stop the script.")
     print("  " + "-" * 56)
 
-    last_clipboard_content = ""
+    # Conversions run in a background task so new clipboard changes are picked
+    # up while Pandoc is busy. Everything runs on the event loop's thread, so
+    # last_clipboard_hash can be shared with the conversion callbacks freely.
+    conversions = ConversionRunner()
+
+    # Only a hash of the last seen content is kept, so unchanged clipboard
+    # content is skipped without comparing (or holding on to) large pastes.
+    last_clipboard_hash = hash("")
     try:
         # Initialize with current clipboard content to avoid processing it on first run
-        last_clipboard_content = pyperclip.paste()
+        last_clipboard_hash = hash(pyperclip.paste())
     except pyperclip.PyperclipException as e:
         print(f"  [Warning] Could not read initial clipboard content: {e}")
         print("           Make sure you have a clipboard manager installed.")
 
-    while True:
+    def copy_typst_output(latex_hash, typst_output):
+        """
+        Conversion callback: copies the Typst output to the clipboard, unless the
+        clipboard changed while Pandoc was running.
+        """
+        nonlocal last_clipboard_hash
+        if typst_output is None:
+            # Pandoc conversion failed, error already printed by convert_latex_to_typst.
+            # last_clipboard_hash still matches the faulty LaTeX, so it won't be re-processed.
+            return
+
+        if last_clipboard_hash != latex_hash:
+            print("\n    Clipboard changed during conversion. Discarding Typst output.")
+            return
         try:
-            current_clipboard_content = pyperclip.paste()
+            pyperclip.copy(typst_output)
+        except pyperclip.PyperclipException as e:
+            # If copy fails, last_clipboard_hash stays at the LaTeX input
+            # to avoid repeatedly trying to process it if it's stuck.
+            print(f"    [Warning] Could not copy Typst to clipboard: {e}")
+            return
+        last_clipboard_hash = hash(typst_output)  # Update with our output to prevent re-processing
+
+        print("    Typst output copied to clipboard.")
+        if SHOW_SNIPPETS:
+            typst_snippet = one_line_snippet(typst_output, 150).strip()
+            print(
+                f"      --- Typst Snippet ---\n      {typst_snippet}\n      ---------------------"
+            )
 
-            # Process only if clipboard has new, non-empty content
-            if (
-                current_clipboard_content
-                and current_clipboard_content != last_clipboard_content
-            ):
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                print(f"\n  New clipboard content detected at {timestamp}:")
-
-                # Display a snippet for brevity
-                snippet = (
-                    (current_clipboard_content[:70] + "...")
-                    if len(current_clipboard_content) > 70
-                    else current_clipboard_content
-                )
-                print(
-                    f"    '{snippet.replace(chr(10), ' ')}'"
-                )  # Replace newlines for compact display
-
-                if is_likely_latex(current_clipboard_content):
-                    print("    Recognized as likely LaTeX. Processing...")
-                    latex_input = current_clipboard_content
-
-                    typst_output = convert_latex_to_typst(latex_input)
-
-                    if typst_output is not None:
-                        # Post-process the Typst output to clean up escaped characters
-                        # Should it cause issues, comment this line out.
-                        typst_output = post_process_typst_output(typst_output)
-                        try:
-                            pyperclip.copy(typst_output)
-                            print("    Typst output copied to clipboard.")
-                            typst_snippet = (
-                                (typst_output[:150] + "...")
-                                if len(typst_output) > 150
-                                else typst_output
-                            )
-                            print(
-                                f"      --- Typst Snippet ---\n      {typst_snippet.replace(chr(10), ' ').strip()}\n      ---------------------"
-                            )
-                            last_clipboard_content = typst_output  # Update with our output to prevent re-processing
-                        except pyperclip.PyperclipException as e:
-                            print(
-                                f"    [Warning] Could not copy Typst to clipboard: {e}"
-                            )
-                            # If copy fails, keep last_clipboard_content as current_clipboard_content
-                            # to avoid repeatedly trying to process the same LaTeX input if it's stuck.
-                            last_clipboard_content = current_clipboard_content
+    try:
+        while True:
+            try:
+                # Wait until the clipboard (possibly) changed
+                await anext(clipboard_changes)
+                current_clipboard_content = pyperclip.paste()
+                current_clipboard_hash = hash(current_clipboard_content)
+
+                # Skip all detection and conversion work for unchanged content.
+                # The hash is updated for every change (including cleared or
+                # non-LaTeX content) to prevent re-evaluating the same content.
+                if current_clipboard_hash == last_clipboard_hash:
+                    continue
+                last_clipboard_hash = current_clipboard_hash
+
+                # Process only if clipboard has new, non-empty content
+                if current_clipboard_content:
+                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"\n  New clipboard content detected at {timestamp}:")
+
+                    # Display a snippet for brevity
+                    if SHOW_SNIPPETS:
+                        print(f"    '{one_line_snippet(current_clipboard_content, 70)}'")
+
+                    if is_likely_latex(current_clipboard_content):
+                        print("    Recognized as likely LaTeX. Processing...")
+                        latex_input = current_clipboard_content
+
+                        conversions.submit(
+                            latex_input,
+                            functools.partial(copy_typst_output, current_clipboard_hash),
+                        )
                     else:
-                        # Pandoc conversion failed, error already printed by convert_latex_to_typst
-                        # Update last_clipboard_content to avoid re-processing faulty LaTeX
-                        last_clipboard_content = current_clipboard_content
-                else:
-                    print("    Not recognized as LaTeX. Skipping conversion.")
-                    last_clipboard_content = current_clipboard_content  # Update to prevent re-evaluating non-LaTeX
+                        print("    Not recognized as LaTeX. Skipping conversion.")
+
+            except StopAsyncIteration:
+                # Watchers fall back to polling instead of ending, so this can't be
+                # retried: every further anext() would raise the same way
+                print("\n  [Error] Stopped watching the clipboard unexpectedly.")
+                raise SystemExit("Clipboard watcher ended. Exiting.") from None
+            except pyperclip.PyperclipException as e:
+                print(f"\n  [Clipboard Error] Could not access the clipboard: {e}")
+                print("  Make sure you have a clipboard manager installed.")
+                print(f"  Retrying in {POLL_INTERVAL_SECONDS * 5} seconds...")
+                await asyncio.sleep(POLL_INTERVAL_SECONDS * 5)
+            except Exception as e:
+                print(f"\n  [Unexpected Error] An error occurred: {e}")
+                print(f"  Retrying in {POLL_INTERVAL_SECONDS * 2} seconds...")
+                await asyncio.sleep(POLL_INTERVAL_SECONDS * 2)
+    finally:
+        # Ctrl+C cancels this task; stop conversions before the server they use
+        await conversions.shutdown()
+        await _stop_pandoc_server()
 
-            # If clipboard content changed (e.g., cleared, or became something already processed/skipped)
-            # but no action was taken above, ensure last_clipboard_content is up-to-date.
-            elif current_clipboard_content != last_clipboard_content:
-                last_clipboard_content = current_clipboard_content
 
-            time.sleep(POLL_INTERVAL_SECONDS)
-
-        except pyperclip.PyperclipException as e:
-            print(f"\n  [Clipboard Error] Could not access the clipboard: {e}")
-            print("  Make sure you have a clipboard manager installed.")
-            print(f"  Retrying in {POLL_INTERVAL_SECONDS * 5} seconds...")
-            time.sleep(POLL_INTERVAL_SECONDS * 5)
-        except KeyboardInterrupt:
-            print("\n\n  Script stopped by user.")
-            break
-        except Exception as e:
-            print(f"\n  [Unexpected Error] An error occurred: {e}")
-            print(f"  Retrying in {POLL_INTERVAL_SECONDS * 2} seconds...")
-            time.sleep(POLL_INTERVAL_SECONDS * 2)
+def main():
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        print("\n\n  Script stopped by user.")
 
 
 if __name__ == "__main__":